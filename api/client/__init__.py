@@ -0,0 +1,5 @@
+"""Client-facing API for interacting with the AstraFS feature platform."""
+
+from api.client.registry import FeatureRegistry, FeatureSpec
+
+__all__ = ["FeatureRegistry", "FeatureSpec"]
@@ -0,0 +1,299 @@
+"""Client-side feature registry: versioned specs and dependency tracking."""
+
+from __future__ import annotations
+
+import graphlib
+import itertools
+import time
+import uuid
+import weakref
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from types import MappingProxyType
+from typing import Callable, DefaultDict, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+from api.dsl.schema import FeatureKey, FeatureMetadata
+
+__all__ = ["FeatureRegistry", "FeatureSpec", "uuid_version"]
+
+
+def uuid_version() -> str:
+    """Random 8-hex version id; inject into the registry when versions
+    must be unpredictable rather than merely unique."""
+    return uuid.uuid4().hex[:8]
+
+
+def _tarjan_scc(
+    graph: Mapping[FeatureKey, Tuple[FeatureKey, ...]]
+) -> List[List[FeatureKey]]:
+    """Iterative Tarjan strongly-connected components over ``graph``.
+
+    Iterative rather than recursive so deep dependency chains cannot hit
+    the interpreter recursion limit.  Edges pointing outside ``graph``
+    are ignored.
+    """
+    index: Dict[FeatureKey, int] = {}
+    lowlink: Dict[FeatureKey, int] = {}
+    on_stack: Set[FeatureKey] = set()
+    stack: List[FeatureKey] = []
+    sccs: List[List[FeatureKey]] = []
+    counter = 0
+
+    for root in graph:
+        if root in index:
+            continue
+        index[root] = lowlink[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(graph[root]))]
+        while work:
+            node, edges = work[-1]
+            descended = False
+            for child in edges:
+                if child not in graph:
+                    continue
+                if child not in index:
+                    index[child] = lowlink[child] = counter
+                    counter += 1
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(graph[child])))
+                    descended = True
+                    break
+                if child in on_stack:
+                    lowlink[node] = min(lowlink[node], index[child])
+            if descended:
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                lowlink[parent] = min(lowlink[parent], lowlink[node])
+            if lowlink[node] == index[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member is node:
+                        break
+                sccs.append(component)
+    return sccs
+
+
+@dataclass(slots=True, weakref_slot=True)
+class FeatureSpec:
+    """One registered version of a feature."""
+
+    key: FeatureKey
+    metadata: FeatureMetadata
+    version: str
+    created_at_ns: int
+    dependencies: Tuple[FeatureKey, ...] = ()
+    is_active: bool = True
+
+    @property
+    def created_at(self) -> datetime:
+        """Registration time; stored as raw epoch-ns, formatted on access."""
+        return datetime.fromtimestamp(self.created_at_ns / 1e9, tz=timezone.utc)
+
+
+class FeatureRegistry:
+    """In-memory registry of feature specs, versioned per ``(name, entity)``.
+
+    ``register`` always creates a new version and makes it the latest;
+    ``deprecate`` retires a key without discarding its history.
+    """
+
+    def __init__(self, version_factory: Optional[Callable[[], str]] = None) -> None:
+        # Default versions are a process-epoch prefix plus a monotonic
+        # counter: unique across processes, ordered within one, and free
+        # of the CSPRNG syscall uuid4 pays on every register call.
+        self._version_factory = version_factory
+        self._epoch = int(time.time())
+        self._version_counter = itertools.count(1)
+        # Two-level index: outer probe by key, inner by version string.
+        # Avoids allocating a (key, version) tuple on every lookup and
+        # lets graph traversal touch each key once, not once per version.
+        self._active: DefaultDict[FeatureKey, Dict[str, FeatureSpec]] = defaultdict(dict)
+        self._latest: Dict[FeatureKey, str] = {}
+        # Deprecated specs are held weakly: callers that kept a reference
+        # keep them alive, everything else is garbage-collected instead
+        # of pinning the registry's memory for the process lifetime.
+        self._deprecated: "weakref.WeakValueDictionary[Tuple[FeatureKey, str], FeatureSpec]" = (
+            weakref.WeakValueDictionary()
+        )
+        # Reverse index so "all features for this entity" is O(k) in the
+        # entity's feature count instead of a scan of the registry.
+        self._by_entity: DefaultDict[str, Set[FeatureKey]] = defaultdict(set)
+        # Reverse adjacency (dependency -> dependents), maintained
+        # incrementally so consumers needing both edge directions don't
+        # rebuild the inverse map on every compile.
+        self._reverse_deps: DefaultDict[FeatureKey, Set[FeatureKey]] = defaultdict(set)
+        # Bumped on every mutation; memoized graph views check it so a
+        # read-heavy workload rebuilds the graph only after changes.
+        self._graph_version = 0
+        self._graph_cache: Optional[
+            Tuple[int, Mapping[FeatureKey, Tuple[FeatureKey, ...]]]
+        ] = None
+        self._reverse_cache: Optional[
+            Tuple[int, Mapping[FeatureKey, Tuple[FeatureKey, ...]]]
+        ] = None
+        self._topo_cache: Optional[Tuple[int, List[FeatureKey], List[List[FeatureKey]]]] = None
+
+    def register(
+        self,
+        metadata: FeatureMetadata,
+        dependencies: Iterable[FeatureKey] = (),
+    ) -> FeatureSpec:
+        """Register a new version of a feature and mark it latest."""
+        key = metadata.key()
+        if self._version_factory is not None:
+            version = self._version_factory()
+        else:
+            version = f"{self._epoch:08x}{next(self._version_counter):x}"
+        spec = FeatureSpec(
+            key=key,
+            metadata=metadata,
+            version=version,
+            created_at_ns=time.time_ns(),
+            # Dedup once at ingest; a sorted tuple is smaller than a set,
+            # iterates without hashing, and gives downstream graph
+            # algorithms a deterministic edge order.
+            dependencies=tuple(
+                sorted(set(dependencies), key=lambda k: (k.entity, k.name))
+            ),
+        )
+        previous = self._latest.get(key)
+        if previous is not None:
+            # A new version supersedes the old one's edges.
+            for dep in self._active[key][previous].dependencies:
+                self._reverse_deps[dep].discard(key)
+        for dep in spec.dependencies:
+            self._reverse_deps[dep].add(key)
+        self._active[key][version] = spec
+        self._latest[key] = version
+        self._by_entity[key.entity].add(key)
+        self._graph_version += 1
+        return spec
+
+    def get(self, name: str, entity: str) -> FeatureSpec:
+        """Return the latest active spec for ``(name, entity)``."""
+        key = FeatureKey(name, entity)
+        version = self._latest.get(key)
+        if version is None:
+            raise KeyError(f"no active feature '{name}' for entity '{entity}'")
+        return self._active[key][version]
+
+    def deprecate(self, name: str, entity: str) -> None:
+        """Retire the feature; its specs stay reachable only while referenced.
+
+        All versions move to the weakly-held deprecated map, so lineage
+        code holding a spec keeps it alive but the registry itself stops
+        pinning retired entries.
+        """
+        key = FeatureKey(name, entity)
+        version = self._latest.pop(key, None)
+        if version is None:
+            raise KeyError(f"no active feature '{name}' for entity '{entity}'")
+        versions = self._active.pop(key)
+        for dep in versions[version].dependencies:
+            self._reverse_deps[dep].discard(key)
+        for spec_version, spec in versions.items():
+            spec.is_active = False
+            self._deprecated[(key, spec_version)] = spec
+        self._by_entity[key.entity].discard(key)
+        self._graph_version += 1
+
+    def list_by_entity(self, entity: str) -> List[FeatureSpec]:
+        """Latest active specs for every feature of ``entity``.
+
+        Served from the incrementally maintained reverse index, so cost
+        scales with the entity's feature count, not the registry size.
+        """
+        return [
+            self._active[key][self._latest[key]]
+            for key in self._by_entity.get(entity, ())
+        ]
+
+    def dependency_graph(self) -> Mapping[FeatureKey, Tuple[FeatureKey, ...]]:
+        """Adjacency map from each active feature to its dependencies.
+
+        The map is memoized until the next ``register``/``deprecate`` and
+        returned as a read-only view; edges are the specs' own deduped,
+        presorted tuples, shared rather than copied.
+        """
+        if self._graph_cache is not None and self._graph_cache[0] == self._graph_version:
+            return self._graph_cache[1]
+        graph: Dict[FeatureKey, Tuple[FeatureKey, ...]] = {}
+        for key, version in self._latest.items():
+            graph[key] = self._active[key][version].dependencies
+        view = MappingProxyType(graph)
+        self._graph_cache = (self._graph_version, view)
+        return view
+
+    def reverse_dependency_graph(self) -> Mapping[FeatureKey, Tuple[FeatureKey, ...]]:
+        """Adjacency map from each active feature to its active dependents.
+
+        The inverse of :meth:`dependency_graph`, served from the
+        incrementally maintained reverse index and memoized the same
+        way, so consumers needing both edge directions (e.g. driving
+        ``graphlib.TopologicalSorter``) pay no rebuild step.
+        """
+        if self._reverse_cache is not None and self._reverse_cache[0] == self._graph_version:
+            return self._reverse_cache[1]
+        graph: Dict[FeatureKey, Tuple[FeatureKey, ...]] = {}
+        for key in self._latest:
+            graph[key] = tuple(
+                sorted(self._reverse_deps.get(key, ()), key=lambda k: (k.entity, k.name))
+            )
+        view = MappingProxyType(graph)
+        self._reverse_cache = (self._graph_version, view)
+        return view
+
+    def topological_order(self, strict: bool = False) -> List[FeatureKey]:
+        """Active features ordered so every dependency precedes its dependents.
+
+        Computed as Tarjan SCCs, condensed to a DAG, then sorted with
+        :class:`graphlib.TopologicalSorter`; the result is cached until
+        the registry mutates.  With ``strict=True`` a dependency cycle
+        raises :class:`graphlib.CycleError`; otherwise members of a cycle
+        appear consecutively in an arbitrary intra-cycle order (see
+        :meth:`cyclic_components` for diagnostics).
+        """
+        order, cycles = self._topo()
+        if strict and cycles:
+            raise graphlib.CycleError(
+                f"dependency cycles among active features: {cycles}"
+            )
+        return order
+
+    def cyclic_components(self) -> List[List[FeatureKey]]:
+        """Strongly connected components with more than one member or a self-loop."""
+        return self._topo()[1]
+
+    def _topo(self) -> Tuple[List[FeatureKey], List[List[FeatureKey]]]:
+        if self._topo_cache is not None and self._topo_cache[0] == self._graph_version:
+            return self._topo_cache[1], self._topo_cache[2]
+        graph = self.dependency_graph()
+        sccs = _tarjan_scc(graph)
+        comp_of = {key: i for i, comp in enumerate(sccs) for key in comp}
+        sorter: graphlib.TopologicalSorter[int] = graphlib.TopologicalSorter()
+        for i in range(len(sccs)):
+            sorter.add(i)
+        cycles = []
+        for key, deps in graph.items():
+            ci = comp_of[key]
+            for dep in deps:
+                cj = comp_of.get(dep)
+                if cj is None:
+                    continue  # dependency on a deprecated/foreign key
+                if cj != ci:
+                    sorter.add(ci, cj)
+                elif len(sccs[ci]) == 1 and sccs[ci] not in cycles:
+                    cycles.append(sccs[ci])  # self-loop
+        cycles.extend(comp for comp in sccs if len(comp) > 1)
+        order = [key for ci in sorter.static_order() for key in sccs[ci]]
+        self._topo_cache = (self._graph_version, order, cycles)
+        return order, cycles
@@ -0,0 +1,5 @@
+"""Python DSL for defining AstraFS features."""
+
+from api.dsl.schema import Feature, FeatureKey, FeatureMetadata
+
+__all__ = ["Feature", "FeatureKey", "FeatureMetadata"]
@@ -0,0 +1,41 @@
+# cython: language_level=3
+"""Compiled FeatureKey: interned fields and a stored hash.
+
+Optional fast path for :mod:`api.dsl.schema`, which falls back to the
+pure-Python dataclass when this extension has not been built.  Compile
+with Cython and place the resulting module next to this file; no other
+wiring is needed.
+
+Behaviour matches the Python class: identity strings are interned at
+construction and the hash of ``(name, entity)`` is computed once, so a
+registry probe reads a cached ``Py_hash_t`` instead of packing a tuple.
+"""
+
+from sys import intern
+
+
+cdef class FeatureKey:
+    """Identity of a feature: a unique ``(name, entity)`` pair."""
+
+    cdef readonly str name
+    cdef readonly str entity
+    cdef Py_hash_t _hash
+
+    def __cinit__(self, str name, str entity):
+        self.name = intern(name)
+        self.entity = intern(entity)
+        self._hash = hash((self.name, self.entity))
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        if isinstance(other, FeatureKey):
+            return (
+                self.name == (<FeatureKey>other).name
+                and self.entity == (<FeatureKey>other).entity
+            )
+        return NotImplemented
+
+    def __repr__(self):
+        return f"FeatureKey(name={self.name!r}, entity={self.entity!r})"
@@ -0,0 +1,135 @@
+"""JIT-compiled building blocks for ``Feature.compute_batch`` implementations.
+
+Every kernel operates on whole column arrays (float64 values, int64
+epoch-nanosecond event times) and produces one output row per input row,
+so results slot straight into ``Feature.evaluate_batch``.  Input rows
+must be sorted by event time.
+
+Explicit signatures are passed to ``numba.njit`` so compilation happens
+once, at import, rather than being paid on the first hot-path call.
+Numba itself is an optional accelerator: without it the same functions
+run as plain Python/NumPy.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - numba is optional
+    njit = None
+
+__all__ = ["batch_signature", "jit_batch", "windowed_count", "windowed_mean", "windowed_sum"]
+
+# Numba signature of a compute_batch kernel (values, times) -> values,
+# keyed by the feature's declared value_type.
+_BATCH_SIGNATURES = {
+    float: "float64[:](float64[:], int64[:])",
+    int: "int64[:](int64[:], int64[:])",
+    bool: "boolean[:](float64[:], int64[:])",
+}
+
+
+def batch_signature(value_type):
+    """Explicit ``compute_batch`` signature for ``value_type``.
+
+    Derived from the feature's metadata so kernels compile once, at
+    decoration, instead of lazily specializing on the first batch.
+    """
+    return _BATCH_SIGNATURES[value_type]
+
+
+def _guard_inner_dispatcher(dispatcher):
+    """Make direct Python calls on an inner dispatcher raise.
+
+    A kernel compiled with ``no_cpython_wrapper`` has no Python entry
+    point, so calling its dispatcher from interpreted code segfaults the
+    process.  Swapping in a subclass whose ``__call__`` raises keeps the
+    object a regular Dispatcher for Numba's typing (jitted callers are
+    unaffected) while turning the mistake into a clear TypeError.
+    """
+
+    def _raise(self, *args, **kwargs):
+        raise TypeError(
+            f"kernel '{dispatcher.py_func.__name__}' was compiled with "
+            "jit_batch(inner=True) and can only be called from jitted code"
+        )
+
+    dispatcher.__class__ = type(
+        "_InnerOnlyDispatcher", (type(dispatcher),), {"__call__": _raise}
+    )
+    return dispatcher
+
+
+def jit_batch(value_type, *, inner=False):
+    """Decorator compiling a ``compute_batch`` kernel for ``value_type``.
+
+    Applies ``njit`` with the signature from :func:`batch_signature` and
+    the standard kernel options.  ``inner=True`` additionally passes
+    ``no_cpython_wrapper``, skipping the Python-object wrapper Numba
+    would otherwise emit: the result is only callable from other jitted
+    code, and calling it from Python raises TypeError (unguarded, it
+    would crash the interpreter outright).  Without numba the function is
+    returned unchanged.
+    """
+    if njit is None:
+        return lambda fn: fn
+    opts = {"cache": True, "fastmath": True, "boundscheck": False}
+    if not inner:
+        return njit(batch_signature(value_type), **opts)
+
+    def decorate(fn):
+        dispatcher = njit(
+            batch_signature(value_type), no_cpython_wrapper=True, **opts
+        )(fn)
+        return _guard_inner_dispatcher(dispatcher)
+
+    return decorate
+
+
+def _windowed_sum(values, times, window_ns):
+    out = np.empty_like(values)
+    acc = 0.0
+    start = 0
+    for i in range(values.shape[0]):
+        acc += values[i]
+        while times[start] < times[i] - window_ns:
+            acc -= values[start]
+            start += 1
+        out[i] = acc
+    return out
+
+
+def _windowed_count(times, window_ns):
+    out = np.empty(times.shape[0], dtype=np.int64)
+    start = 0
+    for i in range(times.shape[0]):
+        while times[start] < times[i] - window_ns:
+            start += 1
+        out[i] = i - start + 1
+    return out
+
+
+def _windowed_mean(values, times, window_ns):
+    out = np.empty_like(values)
+    acc = 0.0
+    start = 0
+    for i in range(values.shape[0]):
+        acc += values[i]
+        while times[start] < times[i] - window_ns:
+            acc -= values[start]
+            start += 1
+        out[i] = acc / (i - start + 1)
+    return out
+
+
+if njit is not None:
+    _jit_opts = {"cache": True, "fastmath": True, "boundscheck": False}
+    windowed_sum = njit("float64[:](float64[:], int64[:], int64)", **_jit_opts)(_windowed_sum)
+    windowed_count = njit("int64[:](int64[:], int64)", **_jit_opts)(_windowed_count)
+    windowed_mean = njit("float64[:](float64[:], int64[:], int64)", **_jit_opts)(_windowed_mean)
+else:
+    windowed_sum = _windowed_sum
+    windowed_count = _windowed_count
+    windowed_mean = _windowed_mean
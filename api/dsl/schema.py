@@ -0,0 +1,225 @@
+"""Feature schema: typed feature definitions and their frozen metadata."""
+
+from __future__ import annotations
+
+import sys
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Type
+
+import numpy as np
+
+__all__ = ["Feature", "FeatureKey", "FeatureMetadata"]
+
+# NumPy abstract kind accepted for each declared Python value type.
+_NP_KIND: Dict[type, type] = {
+    int: np.integer,
+    float: np.floating,
+    bool: np.bool_,
+    str: np.str_,
+}
+
+
+@dataclass(frozen=True, slots=True)
+class FeatureKey:
+    """Identity of a feature: a unique ``(name, entity)`` pair.
+
+    Keys are the hot lookup value for the registry dicts, so the hash is
+    computed once at construction instead of repacking a tuple on every
+    probe.
+    """
+
+    name: str
+    entity: str
+    _hash: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Interned identity strings make dict probes hit the pointer-
+        # equality fast path; the same strings recur across the registry.
+        object.__setattr__(self, "name", sys.intern(self.name))
+        object.__setattr__(self, "entity", sys.intern(self.entity))
+        object.__setattr__(self, "_hash", hash((self.name, self.entity)))
+
+    def __hash__(self) -> int:
+        return self._hash
+
+
+try:
+    # Compiled fast path (api/dsl/_fastkey.pyx): same contract, with the
+    # hash stored in a C field.  The dataclass above remains the
+    # fallback when the extension has not been built.
+    from api.dsl._fastkey import FeatureKey  # type: ignore[assignment, no-redef]
+except ImportError:
+    pass
+
+
+@dataclass(frozen=True, slots=True)
+class FeatureMetadata:
+    """Immutable descriptive record attached to every feature."""
+
+    name: str
+    entity: str
+    value_type: Type[Any]
+    description: str = ""
+    owner: str = ""
+    # Derived once in __post_init__; safe to cache because the dataclass
+    # is frozen.  Read-only views keep callers from mutating the cache.
+    signature_dict: Mapping[str, str] = field(init=False, repr=False, compare=False)
+    signature_hash: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Name/entity/owner repeat across thousands of features; intern
+        # so lookups compare by identity and duplicates share storage.
+        object.__setattr__(self, "name", sys.intern(self.name))
+        object.__setattr__(self, "entity", sys.intern(self.entity))
+        object.__setattr__(self, "owner", sys.intern(self.owner))
+        signature = MappingProxyType(
+            {
+                "name": self.name,
+                "entity": self.entity,
+                "value_type": self.value_type.__name__,
+            }
+        )
+        object.__setattr__(self, "signature_dict", signature)
+        object.__setattr__(self, "signature_hash", hash(tuple(signature.items())))
+
+    def key(self) -> FeatureKey:
+        return FeatureKey(self.name, self.entity)
+
+
+# Template for the per-instance specialized evaluate (see
+# Feature.__init__).  compute, the expected type and the validate slow
+# path are bound as defaults, so the common case is one call plus one
+# isinstance with no attribute lookups or extra frames.
+_EVALUATE_TEMPLATE = """\
+def _fast_evaluate(raw_data, event_time, _compute=_compute, _vt=_vt, _validate=_validate):
+    value = _compute(raw_data, event_time)
+    if isinstance(value, _vt):
+        return value
+    _validate(value)  # dtype-aware slow path; raises TypeError on mismatch
+    return value
+"""
+
+
+def _specialize_evaluate(feature: "Feature"):
+    namespace = {
+        "_compute": feature.compute,
+        "_vt": feature.metadata.value_type,
+        "_validate": feature.validate,
+    }
+    exec(compile(_EVALUATE_TEMPLATE, "<feature-specialize>", "exec"), namespace)
+    return namespace["_fast_evaluate"]
+
+
+class Feature:
+    """Base class for a single named, typed feature.
+
+    Subclasses implement :meth:`compute` (one row at a time) and are
+    strongly encouraged to also implement :meth:`compute_batch` so that
+    evaluation runs vectorized over whole columns instead of paying
+    interpreter overhead per row.  The JIT-compiled kernels in
+    :mod:`api.dsl._kernels` are the intended building blocks for
+    ``compute_batch`` implementations.
+    """
+
+    def __init__(self, metadata: FeatureMetadata) -> None:
+        self._metadata = metadata
+        self._np_kind = _NP_KIND.get(metadata.value_type)
+        # Metadata is immutable, so the invariant part of the validation
+        # error is formatted once here rather than on every failure.
+        self._type_err_prefix = (
+            f"Feature '{metadata.name}' expected value of type "
+            f"{metadata.value_type.__name__}, got "
+        )
+        # Metadata is frozen, so evaluate can be partially evaluated per
+        # instance: compute and the type check are inlined into a
+        # generated closure.  Only done for simple value types and when
+        # the subclass keeps the stock evaluate; anything else stays on
+        # the generic path.
+        if (
+            type(self).evaluate is Feature.evaluate
+            and type(self).compute is not Feature.compute
+            and metadata.value_type in _NP_KIND
+        ):
+            self.evaluate = _specialize_evaluate(self)
+
+    @property
+    def metadata(self) -> FeatureMetadata:
+        return self._metadata
+
+    @property
+    def key(self) -> FeatureKey:
+        return self._metadata.key()
+
+    def signature(self) -> Mapping[str, str]:
+        """Stable description of this feature used for hashing and lineage."""
+        return self._metadata.signature_dict
+
+    # -- per-row path ----------------------------------------------------
+
+    def compute(self, raw_data: Dict[str, Any], event_time: float) -> Any:
+        """Compute the feature value for a single row of raw data."""
+        raise NotImplementedError
+
+    def validate(self, value: Any) -> None:
+        if self._np_kind is not None and hasattr(value, "dtype"):
+            # NumPy scalar or array: one dtype check covers the whole
+            # input, instead of an isinstance call per element.
+            if np.issubdtype(value.dtype, self._np_kind):
+                return
+        elif isinstance(value, self._metadata.value_type):
+            # Value types without a NumPy kind mapping always take this
+            # isinstance path, dtype-bearing or not.
+            return
+        raise TypeError(self._type_err_prefix + type(value).__name__)
+
+    def evaluate(self, raw_data: Dict[str, Any], event_time: float) -> Any:
+        value = self.compute(raw_data, event_time)
+        self.validate(value)
+        return value
+
+    # -- batch path ------------------------------------------------------
+
+    def compute_batch(
+        self, cols: Dict[str, np.ndarray], times: np.ndarray
+    ) -> np.ndarray:
+        """Vectorized :meth:`compute` over column arrays.
+
+        Optional override: ``evaluate_batch`` falls back to the per-row
+        :meth:`compute` when this is not implemented.
+        """
+        raise NotImplementedError
+
+    def evaluate_batch(
+        self, raw_data_cols: Dict[str, np.ndarray], event_times: np.ndarray
+    ) -> np.ndarray:
+        """Evaluate the feature over whole columns at once.
+
+        The result dtype is checked once per batch against ``value_type``
+        rather than once per value, so the hot loop stays inside
+        NumPy/Numba instead of the interpreter.
+        """
+        if type(self).compute_batch is not Feature.compute_batch:
+            values = self.compute_batch(raw_data_cols, event_times)
+        else:
+            # Subclass only provides the per-row compute; loop in Python.
+            values = np.asarray(
+                [
+                    self.compute(
+                        {name: col[i] for name, col in raw_data_cols.items()},
+                        event_times[i],
+                    )
+                    for i in range(len(event_times))
+                ]
+            )
+        if values.size == 0:
+            # An empty fallback batch defaults to float64 regardless of
+            # value_type; there is nothing to type-check anyway.
+            return values
+        kind = _NP_KIND.get(self._metadata.value_type)
+        if kind is not None and not np.issubdtype(values.dtype, kind):
+            raise TypeError(
+                f"Feature '{self._metadata.name}' batch produced dtype "
+                f"{values.dtype}, expected {self._metadata.value_type.__name__}"
+            )
+        return values
@@ -0,0 +1,6 @@
+"""Pytest bootstrap: make the repo root importable so tests can use api.*."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(__file__))
@@ -0,0 +1,232 @@
+"""Unit tests for the Python feature core: api.dsl and api.client."""
+
+import gc
+import graphlib
+
+import numpy as np
+import pytest
+
+from api.client import FeatureRegistry
+from api.dsl import Feature, FeatureKey, FeatureMetadata
+from api.dsl._kernels import windowed_sum
+
+
+class AmountFeature(Feature):
+    def compute(self, raw_data, event_time):
+        return float(raw_data["amount"])
+
+    def compute_batch(self, cols, times):
+        return windowed_sum(cols["amount"], times, np.int64(3_600_000_000_000))
+
+
+class RowOnlyFeature(Feature):
+    def compute(self, raw_data, event_time):
+        return int(raw_data["amount"]) * 2
+
+
+def _metadata(name="txn_sum_1h", entity="user", value_type=float):
+    return FeatureMetadata(name, entity, value_type)
+
+
+def _times(n):
+    return np.arange(n, dtype=np.int64) * 600_000_000_000
+
+
+# -- Feature ------------------------------------------------------------
+
+
+def test_evaluate_returns_value():
+    # Regression for the dropped-return defect: evaluate must hand back
+    # the computed value, on both the specialized and generic paths.
+    feature = AmountFeature(_metadata())
+    assert feature.evaluate({"amount": 2.0}, 0.0) == 2.0
+    generic = RowOnlyFeature(_metadata(value_type=object))
+    assert generic.evaluate({"amount": 3}, 0.0) == 6
+
+
+def test_evaluate_rejects_wrong_type():
+    class Passthrough(Feature):
+        def compute(self, raw_data, event_time):
+            return raw_data["amount"]
+
+    feature = Passthrough(_metadata())
+    with pytest.raises(TypeError, match="expected value of type float, got str"):
+        feature.evaluate({"amount": "oops"}, 0.0)
+
+
+def test_validate_dtype_fast_path():
+    feature = Feature(_metadata())
+    feature.validate(1.5)
+    feature.validate(np.float64(1.5))
+    feature.validate(np.ones(3))
+    for bad in (1, np.int64(1), np.ones(3, dtype=np.int64)):
+        with pytest.raises(TypeError):
+            feature.validate(bad)
+
+
+def test_validate_unmapped_value_type_uses_isinstance():
+    feature = Feature(_metadata(value_type=list))
+    feature.validate([1, 2])
+    for bad in (np.array([1.0]), np.float64(3.0), "x"):
+        with pytest.raises(TypeError):
+            feature.validate(bad)
+
+
+def test_evaluate_batch_vectorized():
+    feature = AmountFeature(_metadata())
+    out = feature.evaluate_batch({"amount": np.ones(10)}, _times(10))
+    assert out.shape == (10,)
+    assert out[0] == 1.0 and out[-1] == 7.0  # 1h window over 10min steps
+
+
+def test_evaluate_batch_per_row_fallback():
+    feature = RowOnlyFeature(_metadata(value_type=int))
+    out = feature.evaluate_batch({"amount": np.arange(4)}, _times(4))
+    assert list(out) == [0, 2, 4, 6]
+
+
+def test_evaluate_batch_empty_input():
+    for value_type in (int, float, bool, str):
+        feature = RowOnlyFeature(_metadata(value_type=value_type))
+        out = feature.evaluate_batch(
+            {"amount": np.empty(0)}, np.empty(0, dtype=np.int64)
+        )
+        assert out.size == 0
+
+
+def test_evaluate_batch_dtype_mismatch():
+    feature = RowOnlyFeature(_metadata())  # declares float, computes int
+    with pytest.raises(TypeError, match="batch produced dtype"):
+        feature.evaluate_batch({"amount": np.arange(3)}, _times(3))
+
+
+def test_signature_cached_and_read_only():
+    feature = Feature(_metadata())
+    signature = feature.signature()
+    assert signature is feature.signature()
+    assert signature["value_type"] == "float"
+    with pytest.raises(TypeError):
+        signature["name"] = "x"
+
+
+# -- FeatureRegistry ----------------------------------------------------
+
+
+def test_register_and_get():
+    registry = FeatureRegistry()
+    spec = registry.register(_metadata())
+    assert registry.get("txn_sum_1h", "user") is spec
+    newer = registry.register(_metadata())
+    assert newer.version != spec.version
+    assert registry.get("txn_sum_1h", "user") is newer
+
+
+def test_get_unknown_raises_keyerror():
+    registry = FeatureRegistry()
+    with pytest.raises(KeyError):
+        registry.get("nope", "user")
+    with pytest.raises(KeyError):
+        registry.deprecate("nope", "user")
+
+
+def test_deprecate_removes_from_lookups():
+    registry = FeatureRegistry()
+    spec = registry.register(_metadata())
+    registry.deprecate("txn_sum_1h", "user")
+    assert not spec.is_active
+    with pytest.raises(KeyError):
+        registry.get("txn_sum_1h", "user")
+    assert registry.list_by_entity("user") == []
+
+
+def test_deprecated_specs_are_weakly_held():
+    registry = FeatureRegistry()
+    spec = registry.register(_metadata())
+    registry.deprecate("txn_sum_1h", "user")
+    assert (spec.key, spec.version) in registry._deprecated
+    del spec
+    gc.collect()
+    assert len(registry._deprecated) == 0
+
+
+def test_list_by_entity():
+    registry = FeatureRegistry()
+    registry.register(_metadata("a"))
+    registry.register(_metadata("b"))
+    registry.register(_metadata("c", entity="txn"))
+    assert {s.key.name for s in registry.list_by_entity("user")} == {"a", "b"}
+    assert registry.list_by_entity("unknown") == []
+
+
+def test_dependency_graph_memoized_until_mutation():
+    registry = FeatureRegistry()
+    registry.register(_metadata("a"))
+    graph = registry.dependency_graph()
+    assert registry.dependency_graph() is graph
+    registry.register(_metadata("b"), [FeatureKey("a", "user")])
+    rebuilt = registry.dependency_graph()
+    assert rebuilt is not graph
+    assert rebuilt[FeatureKey("b", "user")] == (FeatureKey("a", "user"),)
+    with pytest.raises(TypeError):
+        rebuilt[FeatureKey("a", "user")] = ()
+
+
+def test_dependencies_deduped_and_sorted():
+    registry = FeatureRegistry()
+    ka, kb = FeatureKey("a", "user"), FeatureKey("b", "user")
+    registry.register(_metadata("a"))
+    registry.register(_metadata("b"))
+    spec = registry.register(_metadata("c"), [kb, ka, kb])
+    assert spec.dependencies == (ka, kb)
+
+
+def test_topological_order():
+    registry = FeatureRegistry()
+    keys = {name: FeatureKey(name, "user") for name in "abcd"}
+    registry.register(_metadata("a"))
+    registry.register(_metadata("b"), [keys["a"]])
+    registry.register(_metadata("c"), [keys["a"], keys["b"]])
+    registry.register(_metadata("d"), [keys["c"]])
+    order = registry.topological_order(strict=True)
+    position = {key: i for i, key in enumerate(order)}
+    for key, deps in registry.dependency_graph().items():
+        for dep in deps:
+            assert position[dep] < position[key]
+    assert registry.topological_order() is registry.topological_order()
+
+
+def test_topological_order_cycle_handling():
+    registry = FeatureRegistry()
+    kx, ky = FeatureKey("x", "e"), FeatureKey("y", "e")
+    registry.register(FeatureMetadata("x", "e", float), [ky])
+    registry.register(FeatureMetadata("y", "e", float), [kx])
+    with pytest.raises(graphlib.CycleError):
+        registry.topological_order(strict=True)
+    assert set(registry.topological_order()) == {kx, ky}
+    assert [set(c) for c in registry.cyclic_components()] == [{kx, ky}]
+
+
+def test_reverse_dependency_graph():
+    registry = FeatureRegistry()
+    ka, kb, kc = (FeatureKey(n, "user") for n in "abc")
+    registry.register(_metadata("a"))
+    registry.register(_metadata("b"), [ka])
+    registry.register(_metadata("c"), [ka, kb])
+    reverse = registry.reverse_dependency_graph()
+    assert reverse[ka] == (kb, kc)
+    assert reverse[kb] == (kc,)
+    assert reverse[kc] == ()
+    assert registry.reverse_dependency_graph() is reverse
+
+
+def test_reverse_edges_dropped_on_supersede_and_deprecate():
+    registry = FeatureRegistry()
+    ka, kc = FeatureKey("a", "user"), FeatureKey("c", "user")
+    registry.register(_metadata("a"))
+    registry.register(_metadata("b"), [ka])
+    registry.register(_metadata("c"), [ka])
+    # Re-registering b without dependencies supersedes its old edge.
+    registry.register(_metadata("b"))
+    assert registry.reverse_dependency_graph()[ka] == (kc,)
+    registry.deprecate("c", "user")
+    assert registry.reverse_dependency_graph()[ka] == ()